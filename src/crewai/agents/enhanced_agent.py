@@ -6,10 +6,16 @@ et de mémoire à long terme.
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 from pathlib import Path
+import asyncio
 
 from ..agent import Agent
 from ..memory.long_term.smart_memory import SmartMemory
 from ..prompt_manager import PromptManager, PromptTemplate
+from .task_dispatch import aexecute_tasks_parallel, retrieve_memories_batch
+
+# Variables renseignées par l'agent à chaque exécution : la partie statique
+# d'un template s'arrête avant la première d'entre elles
+RUNTIME_VARIABLES = ("relevant_memories",)
 
 
 class EnhancedAgent(Agent):
@@ -49,6 +55,48 @@ class EnhancedAgent(Agent):
                 limit=5
             )
         
+        return self._execute_with_memories(task, context, relevant_memories)
+    
+    async def aexecute_task(
+        self,
+        task: Any,
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Version asynchrone de execute_task, exécutée dans un thread."""
+        return await asyncio.to_thread(self.execute_task, task, context)
+    
+    @staticmethod
+    async def aexecute_tasks_parallel(
+        tasks: List[Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Exécute des tâches indépendantes en parallèle, chacune par son agent.
+        Voir task_dispatch.aexecute_tasks_parallel.
+        """
+        return await aexecute_tasks_parallel(tasks, context)
+    
+    def execute_tasks_batch(
+        self,
+        tasks: List[Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Exécute plusieurs tâches en récupérant leurs souvenirs en une seule fois.
+        """
+        memories_per_task = retrieve_memories_batch(self.memory, tasks, context)
+        return [
+            self._execute_with_memories(task, context, memories)
+            for task, memories in zip(tasks, memories_per_task)
+        ]
+    
+    def _execute_with_memories(
+        self,
+        task: Any,
+        context: Optional[Dict[str, Any]],
+        relevant_memories: List[Any]
+    ) -> str:
+        """Exécute une tâche avec des souvenirs déjà récupérés."""
         # Construire le contexte enrichi
         enriched_context = {
             **(context or {}),
@@ -59,6 +107,9 @@ class EnhancedAgent(Agent):
         if self.prompt_manager:
             task_template = self.prompt_manager.get_template(task.description)
             if task_template:
+                # Agent.execute_task ne transmet qu'une description textuelle ;
+                # les souvenirs y suivent la partie statique, comme dans
+                # use_prompt_messages
                 task.description = task_template.format(**enriched_context)
         
         # Exécuter la tâche
@@ -78,16 +129,27 @@ class EnhancedAgent(Agent):
         
         return result
     
-    def use_prompt_template(self, name: str, **variables) -> str:
+    def use_prompt_template(self, name: str, /, **variables) -> str:
         """Utilise un template de prompt existant."""
         if not self.prompt_manager:
             raise ValueError("Prompt manager not initialized")
             
+        return self.prompt_manager.render_template(name, **variables)
+    
+    def use_prompt_messages(self, name: str, /, **variables) -> List[Dict[str, Any]]:
+        """
+        Construit les messages d'un template : la partie statique, mise en cache
+        par le fournisseur, suivie de la partie dynamique, qui commence à la
+        première variable d'exécution (RUNTIME_VARIABLES).
+        """
+        if not self.prompt_manager:
+            raise ValueError("Prompt manager not initialized")
+            
         template = self.prompt_manager.get_template(name)
         if not template:
             raise KeyError(f"Template '{name}' not found")
             
-        return template.format(**variables)
+        return template.to_messages(RUNTIME_VARIABLES, **variables)
     
     def create_prompt_template(
         self,
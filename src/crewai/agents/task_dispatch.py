@@ -0,0 +1,67 @@
+"""
+Répartition de l'exécution de tâches entre agents.
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+
+
+async def aexecute_tasks_parallel(
+    tasks: List[Any],
+    context: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """
+    Exécute des tâches indépendantes en parallèle, chacune par son agent.
+    Les tâches d'un même agent s'exécutent à la suite, dans l'ordre donné ;
+    un agent sans aexecute_task est exécuté dans un thread.
+    """
+    tasks_by_agent: Dict[int, List[int]] = {}
+    for i, task in enumerate(tasks):
+        if task.agent is None:
+            raise ValueError(
+                f"Task '{task.description}' has no agent to execute it"
+            )
+        tasks_by_agent.setdefault(id(task.agent), []).append(i)
+    
+    results: List[Any] = [None] * len(tasks)
+    
+    async def run_agent_tasks(indices: List[int]):
+        for i in indices:
+            agent = tasks[i].agent
+            aexecute_task = getattr(agent, "aexecute_task", None)
+            if aexecute_task is not None:
+                results[i] = await aexecute_task(tasks[i], context)
+            else:
+                results[i] = await asyncio.to_thread(
+                    agent.execute_task, tasks[i], context
+                )
+    
+    await asyncio.gather(
+        *(run_agent_tasks(indices) for indices in tasks_by_agent.values())
+    )
+    return results
+
+
+def retrieve_memories_batch(
+    memory: Any,
+    tasks: List[Any],
+    context: Optional[Dict[str, Any]] = None,
+    limit: int = 5
+) -> List[List[Any]]:
+    """
+    Récupère les souvenirs pertinents de chaque tâche.
+    Une mémoire offrant retrieve_many traite toutes les requêtes en une fois ;
+    sinon, retrieve est appelée pour chaque tâche.
+    """
+    if not memory or not tasks:
+        return [[] for _ in tasks]
+    
+    queries = [task.description for task in tasks]
+    retrieve_many = getattr(memory, "retrieve_many", None)
+    if retrieve_many:
+        # Un seul calcul d'embeddings pour toutes les requêtes
+        return retrieve_many(queries=queries, context=context or {}, limit=limit)
+    return [
+        memory.retrieve(query=query, context=context or {}, limit=limit)
+        for query in queries
+    ]
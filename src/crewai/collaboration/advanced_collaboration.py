@@ -2,11 +2,14 @@
 Système de collaboration avancée pour les agents FCrew.
 """
 
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from pydantic import BaseModel
 from datetime import datetime
-import networkx as nx
-import json
+import operator
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+import numpy as np
+import orjson
 
 class Skill(BaseModel):
     """Représente une compétence d'agent."""
@@ -24,10 +27,19 @@ class CollaborationLink(BaseModel):
     successful_collaborations: int = 0
     failed_collaborations: int = 0
 
+# Nombre de candidats évalués avant d'élaguer par borne supérieure ; en
+# deçà, les équipes sont construites sans passer par les matrices
+_TEAM_SCORING_CHUNK = 32
+
 class CollaborationNetwork(BaseModel):
     """
     Réseau de collaboration entre agents.
     Gère les relations, compétences et synergies.
+    
+    Les scores s'appuient sur une matrice des compétences reconstruite lorsque
+    les agents sont remplacés, et sur des index de liens creux ; les
+    compétences d'un agent se modifient via add_agent, une modification en
+    place d'un Skill n'étant pas détectée.
     """
     
     agents: Dict[str, Dict[str, Skill]] = {}
@@ -37,12 +49,90 @@ class CollaborationNetwork(BaseModel):
     def __init__(self, **data):
         """Initialise le réseau de collaboration."""
         super().__init__(**data)
-        self._graph = nx.DiGraph()
+        self._rebuild_index()
+        self._matrix_dirty = True
+    
+    def _rebuild_index(self):
+        """Reconstruit les index de liens à partir de self.links."""
+        # Copie des liens indexés, pour détecter les modifications en place
+        self._indexed_links = list(self.links)
+        self._link_index: Dict[Tuple[str, str], CollaborationLink] = {}
+        # Liens sortants de chaque agent et force cumulée (non orientée) de
+        # chaque paire, en listes d'adjacence
+        self._out_links: Dict[str, Dict[str, CollaborationLink]] = {}
+        self._pair_strength: Dict[str, Dict[str, float]] = {}
+        for link in self.links:
+            key = (link.agent_from, link.agent_to)
+            if key not in self._link_index:
+                self._add_link_to_index(link)
+    
+    def _add_link_to_index(self, link: CollaborationLink):
+        """Ajoute un lien encore inconnu aux index."""
+        self._link_index[(link.agent_from, link.agent_to)] = link
+        self._out_links.setdefault(link.agent_from, {})[link.agent_to] = link
+        self._add_pair_strength(link.agent_from, link.agent_to, link.strength)
+    
+    def _add_pair_strength(self, agent_a: str, agent_b: str, delta: float):
+        """Met à jour la force cumulée (non orientée) entre deux agents."""
+        strength = self._pair_strength.get(agent_a, {}).get(agent_b, 0.0) + delta
+        self._pair_strength.setdefault(agent_a, {})[agent_b] = strength
+        self._pair_strength.setdefault(agent_b, {})[agent_a] = strength
+    
+    def _rebuild_matrix(self):
+        """
+        Reconstruit la représentation matricielle du réseau :
+        une ligne par agent, une colonne par compétence.
+        """
+        self._matrix_agents = self.agents
+        self._agent_ids: List[str] = list(self.agents)
+        self._agent_idx: Dict[str, int] = {
+            agent_id: i for i, agent_id in enumerate(self._agent_ids)
+        }
+        self._skill_idx: Dict[str, int] = {}
+        for skills in self.agents.values():
+            for skill_name in skills:
+                self._skill_idx.setdefault(skill_name, len(self._skill_idx))
+        
+        n_agents = len(self._agent_ids)
+        self._skill_matrix = np.zeros((n_agents, len(self._skill_idx)))
+        self._has_skill = np.zeros(self._skill_matrix.shape, dtype=bool)
+        for i, skills in enumerate(self.agents.values()):
+            for skill_name, skill in skills.items():
+                j = self._skill_idx[skill_name]
+                self._skill_matrix[i, j] = skill.level
+                self._has_skill[i, j] = True
+        self._matrix_dirty = False
+    
+    def _ensure_index(self):
+        """Reconstruit les index de liens si self.links a été remplacé ou modifié."""
+        if len(self.links) != len(self._indexed_links) or not all(
+            map(operator.is_, self.links, self._indexed_links)
+        ):
+            self._rebuild_index()
+    
+    def _ensure_matrix(self):
+        """Reconstruit la matrice des compétences si les agents ont changé."""
+        self._ensure_index()
+        if (
+            self._matrix_dirty
+            or self.agents is not self._matrix_agents
+            or list(self.agents) != self._agent_ids
+        ):
+            self._rebuild_matrix()
+    
+    def _pair_strength_row(self, agent_id: str) -> np.ndarray:
+        """Force cumulée entre un agent et chacun des agents de la matrice."""
+        row = np.zeros(len(self._agent_ids))
+        for other, strength in self._pair_strength.get(agent_id, {}).items():
+            j = self._agent_idx.get(other)
+            if j is not None:
+                row[j] = strength
+        return row
     
     def add_agent(self, agent_id: str, skills: Dict[str, Skill]):
-        """Ajoute un agent au réseau."""
+        """Ajoute un agent au réseau, ou remplace ses compétences."""
         self.agents[agent_id] = skills
-        self._graph.add_node(agent_id, skills=skills)
+        self._matrix_dirty = True
     
     def add_collaboration(
         self,
@@ -51,19 +141,23 @@ class CollaborationNetwork(BaseModel):
         strength: float = 0.5
     ):
         """Ajoute ou met à jour un lien de collaboration."""
-        link = CollaborationLink(
-            agent_from=agent_from,
-            agent_to=agent_to,
-            strength=strength,
-            last_interaction=datetime.utcnow()
-        )
-        self.links.append(link)
-        self._graph.add_edge(
-            agent_from,
-            agent_to,
-            weight=strength,
-            link=link
-        )
+        self._ensure_index()
+        link = self._link_index.get((agent_from, agent_to))
+        if link:
+            self._add_pair_strength(agent_from, agent_to,
+                                    strength - link.strength)
+            link.strength = strength
+            link.last_interaction = datetime.utcnow()
+        else:
+            link = CollaborationLink(
+                agent_from=agent_from,
+                agent_to=agent_to,
+                strength=strength,
+                last_interaction=datetime.utcnow()
+            )
+            self.links.append(link)
+            self._indexed_links.append(link)
+            self._add_link_to_index(link)
     
     def update_collaboration(
         self,
@@ -72,17 +166,21 @@ class CollaborationNetwork(BaseModel):
         success: bool
     ):
         """Met à jour les statistiques de collaboration."""
-        for link in self.links:
-            if (link.agent_from == agent_from and
-                link.agent_to == agent_to):
-                if success:
-                    link.successful_collaborations += 1
-                    link.strength = min(1.0, link.strength + 0.1)
-                else:
-                    link.failed_collaborations += 1
-                    link.strength = max(0.0, link.strength - 0.1)
-                link.last_interaction = datetime.utcnow()
-                break
+        self._ensure_index()
+        link = self._link_index.get((agent_from, agent_to))
+        if not link:
+            return
+            
+        previous_strength = link.strength
+        if success:
+            link.successful_collaborations += 1
+            link.strength = min(1.0, link.strength + 0.1)
+        else:
+            link.failed_collaborations += 1
+            link.strength = max(0.0, link.strength - 0.1)
+        link.last_interaction = datetime.utcnow()
+        self._add_pair_strength(agent_from, agent_to,
+                                link.strength - previous_strength)
     
     def find_best_collaborator(
         self,
@@ -92,125 +190,319 @@ class CollaborationNetwork(BaseModel):
         """Trouve le meilleur collaborateur pour une tâche donnée."""
         if agent_id not in self.agents:
             return None
+        self._ensure_matrix()
+        
+        # Vecteur des compétences requises, pondéré pour donner une moyenne
+        required = np.zeros(len(self._skill_idx))
+        for skill in required_skills:
+            skill_idx = self._skill_idx.get(skill)
+            if skill_idx is not None:
+                required[skill_idx] += 1.0 / len(required_skills)
+        
+        # Score basé sur les compétences et la force du lien
+        agent_idx = self._agent_idx.get(agent_id)
+        if agent_idx is None:
+            return None
+        # Force des liens sortants de l'agent, 0.5 en l'absence de lien
+        strength = np.full(len(self._agent_ids), 0.5)
+        for other, link in self._out_links.get(agent_id, {}).items():
+            other_idx = self._agent_idx.get(other)
+            if other_idx is not None:
+                strength[other_idx] = link.strength
+        scores = self._skill_matrix @ required * 0.7 + strength * 0.3
+        scores[agent_idx] = -np.inf
+        
+        best_idx = int(np.argmax(scores))
+        if scores[best_idx] <= 0.0:
+            return None
+        return self._agent_ids[best_idx]
+    
+    def create_optimal_team(
+        self,
+        task_requirements: Dict[str, float],
+        team_size: int
+    ) -> List[str]:
+        """Crée une équipe optimale pour une tâche donnée."""
+        if len(self.agents) <= _TEAM_SCORING_CHUNK:
+            return self._create_small_team(task_requirements, team_size)
+        
+        self._ensure_matrix()
+        team: List[str] = []
+        in_team = np.zeros(len(self._agent_ids), dtype=bool)
+        remaining_skills = task_requirements.copy()
+        # Somme des forces de collaboration de chaque agent avec l'équipe
+        team_strength = np.zeros(len(self._agent_ids))
+        
+        # Borne supérieure du score de chaque agent, valable pour toute la
+        # construction puisque les besoins restants ne font que diminuer
+        columns = [self._skill_idx[skill_name]
+                   for skill_name in task_requirements
+                   if skill_name in self._skill_idx]
+        required = np.array([max(task_requirements[skill_name], 0.0)
+                             for skill_name in task_requirements
+                             if skill_name in self._skill_idx])
+        upper_bound = np.maximum(np.where(
+            self._has_skill[:, columns],
+            np.minimum(self._skill_matrix[:, columns], required),
+            0.0
+        ), 0.0).sum(axis=1)
+        # Plus forte collaboration de chaque agent ; les extrémités qui ne
+        # sont pas des agents ne font qu'élargir la borne
+        best_pair = np.zeros(len(self._agent_ids))
+        for agent_id, i in self._agent_idx.items():
+            pairs = self._pair_strength.get(agent_id)
+            if pairs:
+                best_pair[i] = max(pairs.values())
+        upper_bound += np.maximum(best_pair, 0.0) * 0.3
+        candidates_order = np.argsort(-upper_bound, kind="stable")
+        
+        while len(team) < team_size and remaining_skills and not in_team.all():
+            columns = [self._skill_idx[skill_name]
+                       for skill_name in remaining_skills
+                       if skill_name in self._skill_idx]
+            remaining = np.array([remaining_skills[skill_name]
+                                  for skill_name in remaining_skills
+                                  if skill_name in self._skill_idx])
+            candidates = candidates_order[~in_team[candidates_order]]
             
-        best_score = 0.0
-        best_collaborator = None
-        
-        for potential_id, skills in self.agents.items():
-            if potential_id == agent_id:
-                continue
-                
-            # Calcul du score basé sur les compétences et la force du lien
-            skill_score = sum(
-                skills.get(skill, Skill(name=skill, level=0.0, description="")).level
-                for skill in required_skills
-            ) / len(required_skills)
-            
-            # Trouver le lien de collaboration s'il existe
-            collaboration_strength = 0.5  # valeur par défaut
-            for link in self.links:
-                if (link.agent_from == agent_id and
-                    link.agent_to == potential_id):
-                    collaboration_strength = link.strength
-                    break
+            # Évaluer d'abord les candidats les plus prometteurs, puis
+            # seulement ceux dont la borne peut atteindre le meilleur score
+            head = candidates[:_TEAM_SCORING_CHUNK]
+            head_scores = self._team_scores(
+                head, columns, remaining, team_strength, len(team)
+            )
+            rest = candidates[_TEAM_SCORING_CHUNK:]
+            rest = rest[upper_bound[rest] >= head_scores.max()]
+            evaluated = np.concatenate([head, rest])
+            scores = np.concatenate([
+                head_scores,
+                self._team_scores(rest, columns, remaining,
+                                  team_strength, len(team))
+            ])
             
-            total_score = skill_score * 0.7 + collaboration_strength * 0.3
+            # À score égal, l'agent ajouté en premier au réseau l'emporte
+            best_score = scores.max()
+            if best_score <= 0.0:
+                break
+            best_idx = int(evaluated[scores == best_score].min())
             
-            if total_score > best_score:
-                best_score = total_score
-                best_collaborator = potential_id
+            best_agent = self._agent_ids[best_idx]
+            team.append(best_agent)
+            in_team[best_idx] = True
+            team_strength += self._pair_strength_row(best_agent)
+            self._consume_skills(remaining_skills, self.agents[best_agent])
         
-        return best_collaborator
+        return team
     
-    def create_optimal_team(
+    def _create_small_team(
         self,
         task_requirements: Dict[str, float],
         team_size: int
     ) -> List[str]:
-        """Crée une équipe optimale pour une tâche donnée."""
-        team = []
+        """
+        Crée une équipe par boucles simples, plus rapides que les matrices
+        sur un petit réseau.
+        """
+        self._ensure_index()
+        team: List[str] = []
+        members: Set[str] = set()
         remaining_skills = task_requirements.copy()
+        # Somme des forces de collaboration de chaque agent avec l'équipe
+        team_strength: Dict[str, float] = {}
         
         while len(team) < team_size and remaining_skills:
             best_agent = None
             best_score = 0.0
-            
             for agent_id, skills in self.agents.items():
-                if agent_id in team:
+                if agent_id in members:
                     continue
-                
-                # Calcul du score de contribution
                 score = 0.0
                 for skill_name, required_level in remaining_skills.items():
-                    if skill_name in skills:
-                        score += min(skills[skill_name].level,
-                                   required_level)
-                
-                # Bonus pour la collaboration avec l'équipe existante
+                    skill = skills.get(skill_name)
+                    if skill is not None:
+                        score += min(skill.level, required_level)
                 if team:
-                    collaboration_score = 0.0
-                    for team_member in team:
-                        for link in self.links:
-                            if ((link.agent_from == agent_id and
-                                 link.agent_to == team_member) or
-                                (link.agent_from == team_member and
-                                 link.agent_to == agent_id)):
-                                collaboration_score += link.strength
-                    score += collaboration_score / len(team) * 0.3
-                
+                    score += team_strength.get(agent_id, 0.0) / len(team) * 0.3
                 if score > best_score:
                     best_score = score
                     best_agent = agent_id
-            
-            if best_agent:
-                team.append(best_agent)
-                # Mettre à jour les compétences restantes nécessaires
-                for skill_name in list(remaining_skills.keys()):
-                    if skill_name in self.agents[best_agent]:
-                        remaining_skills[skill_name] = max(
-                            0.0,
-                            remaining_skills[skill_name] -
-                            self.agents[best_agent][skill_name].level
-                        )
-                        if remaining_skills[skill_name] == 0.0:
-                            del remaining_skills[skill_name]
-            else:
+            if best_agent is None:
                 break
+            
+            team.append(best_agent)
+            members.add(best_agent)
+            for agent_id, strength in self._pair_strength.get(best_agent, {}).items():
+                team_strength[agent_id] = (
+                    team_strength.get(agent_id, 0.0) + strength
+                )
+            self._consume_skills(remaining_skills, self.agents[best_agent])
         
         return team
     
-    def analyze_network(self) -> Dict:
-        """Analyse le réseau de collaboration."""
-        return {
-            "density": nx.density(self._graph),
-            "centrality": nx.degree_centrality(self._graph),
-            "communities": list(nx.community.greedy_modularity_communities(
-                self._graph.to_undirected()
-            )),
-            "average_clustering": nx.average_clustering(
-                self._graph.to_undirected()
+    @staticmethod
+    def _consume_skills(
+        remaining_skills: Dict[str, float],
+        skills: Dict[str, Skill]
+    ):
+        """Retire des compétences restantes la contribution d'un membre."""
+        for skill_name in list(remaining_skills.keys()):
+            if skill_name in skills:
+                remaining_skills[skill_name] = max(
+                    0.0,
+                    remaining_skills[skill_name] - skills[skill_name].level
+                )
+                if remaining_skills[skill_name] == 0.0:
+                    del remaining_skills[skill_name]
+    
+    def _team_scores(
+        self,
+        rows: np.ndarray,
+        columns: List[int],
+        remaining: np.ndarray,
+        team_strength: np.ndarray,
+        team_len: int
+    ) -> np.ndarray:
+        """Calcule le score de contribution d'un ensemble d'agents candidats."""
+        # Contribution aux compétences encore requises
+        block = np.ix_(rows, np.asarray(columns, dtype=np.intp))
+        scores = np.where(
+            self._has_skill[block],
+            np.minimum(self._skill_matrix[block], remaining),
+            0.0
+        ).sum(axis=1)
+        
+        # Bonus pour la collaboration avec l'équipe existante
+        if team_len:
+            scores += team_strength[rows] / team_len * 0.3
+        return scores
+    
+    def _adjacency(self) -> Tuple[List[str], sparse.csr_matrix]:
+        """
+        Construit la matrice d'adjacence creuse (CSR) du réseau.
+        Les nœuds sont les agents puis les extrémités de liens inconnues.
+        """
+        self._ensure_index()
+        nodes = list(self.agents)
+        node_idx = {node: i for i, node in enumerate(nodes)}
+        for agent_from, agent_to in self._link_index:
+            for node in (agent_from, agent_to):
+                if node not in node_idx:
+                    node_idx[node] = len(nodes)
+                    nodes.append(node)
+        
+        rows = [node_idx[agent_from] for agent_from, _ in self._link_index]
+        cols = [node_idx[agent_to] for _, agent_to in self._link_index]
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(nodes), len(nodes))
+        )
+        return nodes, adjacency
+    
+    def analyze_network(self, modularity_communities: bool = False) -> Dict:
+        """
+        Analyse le réseau de collaboration.
+        Les communautés sont les composantes connexes, sauf si
+        modularity_communities est demandé (nécessite networkx).
+        """
+        nodes, adjacency = self._adjacency()
+        n_nodes = len(nodes)
+        
+        # Densité et centralité de degré du graphe orienté
+        if n_nodes <= 1:
+            density = 0.0
+            centrality = {node: 1.0 for node in nodes}
+        else:
+            density = adjacency.nnz / (n_nodes * (n_nodes - 1))
+            degrees = (np.asarray(adjacency.sum(axis=0)).ravel() +
+                       np.asarray(adjacency.sum(axis=1)).ravel())
+            centrality = dict(zip(nodes, (degrees / (n_nodes - 1)).tolist()))
+        
+        # Graphe non orienté
+        undirected = ((adjacency + adjacency.T) > 0).astype(np.float64)
+        
+        if modularity_communities:
+            communities = self._modularity_communities(nodes, undirected)
+        else:
+            _, labels = connected_components(undirected, directed=False)
+            groups: Dict[int, Set[str]] = {}
+            for node, label in zip(nodes, labels):
+                groups.setdefault(label, set()).add(node)
+            communities = sorted(
+                (frozenset(group) for group in groups.values()),
+                key=len,
+                reverse=True
             )
+        
+        # Coefficient de clustering moyen : triangles / paires de voisins,
+        # les boucles étant ignorées
+        undirected.setdiag(0)
+        undirected.eliminate_zeros()
+        degree = np.asarray(undirected.sum(axis=1)).ravel()
+        triangles = np.asarray(
+            (undirected @ undirected).multiply(undirected).sum(axis=1)
+        ).ravel() / 2
+        possible = degree * (degree - 1) / 2
+        clustering = np.divide(
+            triangles, possible, out=np.zeros(n_nodes), where=possible > 0
+        )
+        
+        return {
+            "density": density,
+            "centrality": centrality,
+            "communities": communities,
+            "average_clustering": float(clustering.mean()) if n_nodes else 0.0
         }
     
+    @staticmethod
+    def _modularity_communities(
+        nodes: List[str],
+        undirected: sparse.csr_matrix
+    ) -> List[frozenset]:
+        """Détecte les communautés par modularité gloutonne via networkx."""
+        try:
+            import networkx as nx
+        except ImportError as e:
+            raise ImportError(
+                "networkx is not installed. Please install it to detect "
+                "communities by modularity."
+            ) from e
+        
+        graph = nx.from_scipy_sparse_array(undirected)
+        return [
+            frozenset(nodes[i] for i in community)
+            for community in nx.community.greedy_modularity_communities(graph)
+        ]
+    
+    def _iter_network_json(self) -> Iterator[bytes]:
+        """Sérialise le réseau en JSON, morceau par morceau."""
+        yield b'{"agents":{'
+        for i, (agent_id, skills) in enumerate(self.agents.items()):
+            if i:
+                yield b','
+            yield orjson.dumps(agent_id)
+            yield b':'
+            yield orjson.dumps({
+                skill_name: skill.model_dump()
+                for skill_name, skill in skills.items()
+            })
+        yield b'},"links":['
+        for i, link in enumerate(self.links):
+            if i:
+                yield b','
+            yield orjson.dumps(link.model_dump())
+        yield b'],"teams":'
+        yield orjson.dumps(self.teams)
+        yield b'}'
+    
     def save_network(self, file_path: str):
         """Sauvegarde le réseau de collaboration."""
-        with open(file_path, 'w') as f:
-            json.dump({
-                "agents": {
-                    agent_id: {
-                        skill_name: skill.dict()
-                        for skill_name, skill in skills.items()
-                    }
-                    for agent_id, skills in self.agents.items()
-                },
-                "links": [link.dict() for link in self.links],
-                "teams": self.teams
-            }, f, indent=2)
+        with open(file_path, 'wb') as f:
+            f.writelines(self._iter_network_json())
     
     def load_network(self, file_path: str):
         """Charge le réseau de collaboration."""
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
             self.agents = {
                 agent_id: {
                     skill_name: Skill(**skill_data)
@@ -220,15 +512,5 @@ class CollaborationNetwork(BaseModel):
             }
             self.links = [CollaborationLink(**link) for link in data["links"]]
             self.teams = data["teams"]
-            
-            # Reconstruire le graphe
-            self._graph = nx.DiGraph()
-            for agent_id, skills in self.agents.items():
-                self._graph.add_node(agent_id, skills=skills)
-            for link in self.links:
-                self._graph.add_edge(
-                    link.agent_from,
-                    link.agent_to,
-                    weight=link.strength,
-                    link=link
-                ) 
\ No newline at end of file
+            self._rebuild_index()
+            self._rebuild_matrix()
@@ -5,10 +5,19 @@ Configuration settings for FCrew.
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from pathlib import Path
-import json
+from functools import lru_cache
+import orjson
 import os
 
 
+@lru_cache(maxsize=None)
+def _default_storage_path(name: str) -> str:
+    """Create the default storage directory once and return its path."""
+    default_path = os.path.expanduser(f"~/.fcrew/{name}")
+    os.makedirs(default_path, exist_ok=True)
+    return default_path
+
+
 class FCrewConfig(BaseModel):
     """Configuration settings for FCrew."""
     
@@ -32,17 +41,26 @@ class FCrewConfig(BaseModel):
         if not path.exists():
             return cls()
             
-        with open(path, 'r') as f:
-            config_data = json.load(f)
-            return cls(**config_data)
+        config_data = orjson.loads(path.read_bytes())
+        return cls(**config_data)
     
     def save_to_file(self, config_path: str):
-        """Save configuration to a JSON file."""
+        """
+        Save configuration to a JSON file.
+        The file is written next to the target then renamed, so it is never
+        left partially written.
+        """
         path = Path(config_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(path, 'w') as f:
-            json.dump(self.dict(), f, indent=2)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(
+            orjson.dumps(
+                self.model_dump(),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        )
+        os.replace(tmp_path, path)
     
     @property
     def effective_prompt_storage_path(self) -> str:
@@ -50,9 +68,7 @@ class FCrewConfig(BaseModel):
         if self.prompt_storage_path:
             return self.prompt_storage_path
             
-        default_path = os.path.expanduser("~/.fcrew/prompts")
-        os.makedirs(default_path, exist_ok=True)
-        return default_path
+        return _default_storage_path("prompts")
     
     @property
     def effective_memory_storage_path(self) -> str:
@@ -60,6 +76,4 @@ class FCrewConfig(BaseModel):
         if self.memory_storage_path:
             return self.memory_storage_path
             
-        default_path = os.path.expanduser("~/.fcrew/memory")
-        os.makedirs(default_path, exist_ok=True)
-        return default_path 
\ No newline at end of file
+        return _default_storage_path("memory") 
\ No newline at end of file
@@ -2,12 +2,26 @@
 Système d'apprentissage par renforcement pour les agents FCrew.
 """
 
-from typing import Dict, List, Optional, Tuple
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, computed_field
 import numpy as np
 from datetime import datetime
 import json
+import operator
 import os
+import random
+
+class _ReadOnlyDict(dict):
+    """Dictionnaire qui refuse toute modification sur place."""
+    
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(
+            "q_table est en lecture seule : réassignez-la entièrement "
+            "ou utilisez update"
+        )
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _read_only  # type: ignore[assignment]
 
 class Experience(BaseModel):
     """Représente une expérience d'apprentissage."""
@@ -31,12 +45,17 @@ class ReinforcementLearning(BaseModel):
     exploration_decay: float = 0.995
     
     experiences: List[Experience] = []
-    q_table: Dict[str, Dict[str, float]] = {}
     action_space: List[str] = []
     
-    def __init__(self, **data):
-        """Initialise le système d'apprentissage."""
+    def __init__(self, rng: Optional[random.Random] = None, **data):
+        """
+        Initialise le système d'apprentissage.
+        Un générateur aléatoire peut être fourni pour rendre l'exploration
+        reproductible.
+        """
+        q_table = data.pop("q_table", None)
         super().__init__(**data)
+        self._rng = rng if rng is not None else random
         self.action_space = [
             "ask_question",
             "search_memory",
@@ -45,56 +64,108 @@ class ReinforcementLearning(BaseModel):
             "request_clarification",
             "propose_solution"
         ]
+        self._action_index = {
+            action: i for i, action in enumerate(self.action_space)
+        }
+        # Q-table dense : une ligne par état rencontré, une colonne par action
+        self._state_id: Dict[Tuple[Tuple[str, float], ...], int] = {}
+        self._Q = np.zeros((64, len(self.action_space)))
+        if q_table is not None:
+            self.q_table = q_table
+        self._reset_rewards()
+    
+    def _reset_rewards(self):
+        """Reconstruit le tableau contigu des récompenses des expériences."""
+        # Expériences dont les récompenses sont dans le tableau
+        self._rewarded = list(self.experiences)
+        self._n_rewards = len(self.experiences)
+        self._rewards = np.empty(max(1024, self._n_rewards))
+        self._rewards[:self._n_rewards] = [
+            exp.reward for exp in self.experiences
+        ]
+        
+    def _rewards_in_sync(self) -> bool:
+        """Vérifie que le tableau des récompenses suit les mêmes expériences."""
+        return len(self._rewarded) == len(self.experiences) and all(
+            map(operator.is_, self._rewarded, self.experiences)
+        )
         
-    def state_to_key(self, state: Dict[str, float]) -> str:
-        """Convertit un état en clé pour la Q-table."""
-        return json.dumps(sorted(state.items()))
+    def state_to_key(self, state: Dict[str, float]) -> Tuple[Tuple[str, float], ...]:
+        """Convertit un état en clé (hachable) pour la Q-table."""
+        return tuple(sorted(state.items()))
+    
+    def _state_index(self, state_key: Tuple[Tuple[str, float], ...]) -> int:
+        """Retourne la ligne d'un état dans la Q-table, en la créant au besoin."""
+        sid = self._state_id.get(state_key)
+        if sid is None:
+            sid = len(self._state_id)
+            if sid == len(self._Q):
+                self._Q = np.vstack([self._Q, np.zeros_like(self._Q)])
+            self._state_id[state_key] = sid
+        return sid
+    
+    @computed_field  # type: ignore[misc]
+    @property
+    def q_table(self) -> Dict[str, Dict[str, float]]:
+        """
+        Q-table sous forme de dictionnaire, indexée par état sérialisé.
+        Il s'agit d'une copie en lecture seule : pour la modifier, il faut
+        la réassigner entièrement.
+        """
+        return _ReadOnlyDict(
+            (json.dumps(state_key), _ReadOnlyDict(
+                zip(self.action_space, self._Q[sid].tolist())
+            ))
+            for state_key, sid in self._state_id.items()
+        )
+    
+    @q_table.setter
+    def q_table(self, q_table: Dict[str, Dict[str, float]]) -> None:
+        """Remplace les valeurs de la Q-table par celles du dictionnaire."""
+        self._state_id = {}
+        self._Q = np.zeros((max(64, len(q_table)), len(self.action_space)))
+        for state_key, values in q_table.items():
+            sid = self._state_index(
+                tuple(tuple(item) for item in json.loads(state_key))
+            )
+            for action, value in values.items():
+                if action in self._action_index:
+                    self._Q[sid, self._action_index[action]] = value
     
     def get_action(self, state: Dict[str, float]) -> str:
         """
         Sélectionne une action en utilisant la politique epsilon-greedy.
         """
-        if np.random.random() < self.exploration_rate:
-            return np.random.choice(self.action_space)
+        if self._rng.random() < self.exploration_rate:
+            return self.action_space[self._rng.randrange(len(self.action_space))]
             
-        state_key = self.state_to_key(state)
-        if state_key not in self.q_table:
-            self.q_table[state_key] = {
-                action: 0.0 for action in self.action_space
-            }
-            
-        return max(self.q_table[state_key].items(),
-                  key=lambda x: x[1])[0]
+        sid = self._state_index(self.state_to_key(state))
+        return self.action_space[int(self._Q[sid].argmax())]
     
     def update(self, experience: Experience):
         """
         Met à jour la Q-table avec une nouvelle expérience.
         """
-        state_key = self.state_to_key(experience.state)
-        next_state_key = self.state_to_key(experience.next_state)
-        
         # Initialiser les états s'ils n'existent pas
-        if state_key not in self.q_table:
-            self.q_table[state_key] = {
-                action: 0.0 for action in self.action_space
-            }
-        if next_state_key not in self.q_table:
-            self.q_table[next_state_key] = {
-                action: 0.0 for action in self.action_space
-            }
+        sid = self._state_index(self.state_to_key(experience.state))
+        next_sid = self._state_index(self.state_to_key(experience.next_state))
+        aid = self._action_index[experience.action]
         
         # Q-learning update
-        current_q = self.q_table[state_key][experience.action]
-        next_max_q = max(self.q_table[next_state_key].values())
+        current_q = self._Q[sid, aid]
+        next_max_q = self._Q[next_sid].max()
         
-        new_q = current_q + self.learning_rate * (
+        self._Q[sid, aid] = current_q + self.learning_rate * (
             experience.reward +
             self.discount_factor * next_max_q -
             current_q
         )
-        
-        self.q_table[state_key][experience.action] = new_q
         self.experiences.append(experience)
+        self._rewarded.append(experience)
+        if self._n_rewards == len(self._rewards):
+            self._rewards = np.resize(self._rewards, 2 * len(self._rewards))
+        self._rewards[self._n_rewards] = experience.reward
+        self._n_rewards += 1
         
         # Mettre à jour le taux d'exploration
         self.exploration_rate = max(
@@ -102,11 +173,70 @@ class ReinforcementLearning(BaseModel):
             self.exploration_rate * self.exploration_decay
         )
     
+    def update_batch(self, experiences: List[Experience]):
+        """
+        Met à jour la Q-table avec un lot d'expériences en une seule passe.
+        Les cibles sont calculées à partir de la Q-table avant le lot ; les
+        répétitions d'une même paire (état, action) sont appliquées dans
+        l'ordre du lot, comme des appels successifs à update.
+        """
+        if not experiences:
+            return
+            
+        sids = np.array([
+            self._state_index(self.state_to_key(exp.state))
+            for exp in experiences
+        ])
+        next_sids = np.array([
+            self._state_index(self.state_to_key(exp.next_state))
+            for exp in experiences
+        ])
+        aids = np.array([self._action_index[exp.action] for exp in experiences])
+        rewards = np.array([exp.reward for exp in experiences])
+        
+        # Q-learning update vectorisé
+        targets = rewards + self.discount_factor * self._Q[next_sids].max(axis=1)
+        
+        # k mises à jour successives d'une paire donnent
+        # (1 - lr)^k * Q + somme des lr * (1 - lr)^(k - 1 - rang) * cible
+        pairs = sids * len(self.action_space) + aids
+        unique_pairs, inverse, counts = np.unique(
+            pairs, return_inverse=True, return_counts=True
+        )
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(len(order)) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        keep = 1.0 - self.learning_rate
+        weights = self.learning_rate * keep ** (counts[inverse] - 1 - ranks)
+        rows, cols = np.divmod(unique_pairs, len(self.action_space))
+        self._Q[rows, cols] = keep ** counts * self._Q[rows, cols] + np.bincount(
+            inverse, weights=weights * targets, minlength=len(unique_pairs)
+        )
+        
+        self.experiences.extend(experiences)
+        self._rewarded.extend(experiences)
+        n_rewards = self._n_rewards + len(rewards)
+        if n_rewards > len(self._rewards):
+            self._rewards = np.resize(
+                self._rewards, max(n_rewards, 2 * len(self._rewards))
+            )
+        self._rewards[self._n_rewards:n_rewards] = rewards
+        self._n_rewards = n_rewards
+        
+        # Mettre à jour le taux d'exploration
+        self.exploration_rate = max(
+            self.min_exploration_rate,
+            self.exploration_rate * self.exploration_decay ** len(experiences)
+        )
+    
     def get_state_value(self, state: Dict[str, float]) -> float:
         """Calcule la valeur d'un état."""
-        state_key = self.state_to_key(state)
-        if state_key in self.q_table:
-            return max(self.q_table[state_key].values())
+        sid = self._state_id.get(self.state_to_key(state))
+        if sid is not None:
+            return float(self._Q[sid].max())
         return 0.0
     
     def get_best_action_sequence(
@@ -140,7 +270,9 @@ class ReinforcementLearning(BaseModel):
             json.dump({
                 "q_table": self.q_table,
                 "exploration_rate": self.exploration_rate,
-                "experiences": [exp.dict() for exp in self.experiences]
+                "experiences": [
+                    exp.model_dump(mode="json") for exp in self.experiences
+                ]
             }, f, indent=2)
     
     def load_model(self, file_path: str):
@@ -153,17 +285,21 @@ class ReinforcementLearning(BaseModel):
                 self.experiences = [
                     Experience(**exp) for exp in data["experiences"]
                 ]
+                self._reset_rewards()
     
     def analyze_performance(self) -> Dict[str, float]:
         """Analyse les performances d'apprentissage."""
         if not self.experiences:
             return {}
             
-        rewards = [exp.reward for exp in self.experiences]
+        # experiences est public : il a pu être modifié sans passer par update
+        if not self._rewards_in_sync():
+            self._reset_rewards()
+        rewards = self._rewards[:self._n_rewards]
         return {
-            "average_reward": np.mean(rewards),
-            "max_reward": max(rewards),
-            "min_reward": min(rewards),
+            "average_reward": float(rewards.mean()),
+            "max_reward": float(rewards.max()),
+            "min_reward": float(rewards.min()),
             "total_experiences": len(self.experiences),
             "exploration_rate": self.exploration_rate
         } 
\ No newline at end of file
@@ -2,12 +2,26 @@
 Système de gestion de la personnalité et des émotions des agents.
 """
 
-from typing import Dict, List, Optional
-from pydantic import BaseModel
+from typing import Any, Deque, Dict, List, Optional
+from pydantic import BaseModel, Field
+from collections import deque
 from datetime import datetime
 import json
+import orjson
+import os
+import re
 import numpy as np
 
+# Mots-clés utilisés pour détecter les émotions dans les interactions
+POSITIVE_WORDS = ["excellent", "super", "bravo", "merci"]
+NEGATIVE_WORDS = ["erreur", "problème", "mauvais", "échec"]
+_POSITIVE_RE = re.compile("|".join(map(re.escape, POSITIVE_WORDS)), re.IGNORECASE)
+_NEGATIVE_RE = re.compile("|".join(map(re.escape, NEGATIVE_WORDS)), re.IGNORECASE)
+
+# Ponctuation selon le niveau d'extraversion
+_EXCITED_TABLE = str.maketrans({".": "!"})
+_CALM_TABLE = str.maketrans({"!": "."})
+
 class EmotionalState(BaseModel):
     """État émotionnel de l'agent."""
     joy: float = 0.5
@@ -21,11 +35,18 @@ class EmotionalState(BaseModel):
 
     def update(self, stimulus: Dict[str, float], intensity: float = 0.1):
         """Met à jour l'état émotionnel en fonction d'un stimulus."""
+        # Accès direct aux valeurs, seules les émotions connues sont modifiées ;
+        # les champs modifiés sont marqués comme définis, comme par une affectation
+        values = self.__dict__
+        fields_set = self.__pydantic_fields_set__
         for emotion, value in stimulus.items():
-            if hasattr(self, emotion):
-                current = getattr(self, emotion)
-                setattr(self, emotion, 
-                       max(0.0, min(1.0, current + value * intensity)))
+            if emotion in EMOTIONS:
+                values[emotion] = max(
+                    0.0, min(1.0, values[emotion] + value * intensity)
+                )
+                fields_set.add(emotion)
+
+EMOTIONS = frozenset(EmotionalState.model_fields)
 
 class PersonalityTrait(BaseModel):
     """Trait de personnalité de l'agent."""
@@ -69,46 +90,63 @@ class AgentPersonality(BaseModel):
     
     emotional_state: EmotionalState = EmotionalState()
     emotional_history: List[Dict] = []
+    # Journal NDJSON de l'historique : seule une fenêtre glissante reste en mémoire
+    history_path: Optional[str] = None
+    history_window: int = Field(default=100, ge=1)
     
     def adjust_response(self, response: str) -> str:
         """Ajuste la réponse en fonction de la personnalité et des émotions."""
+        prefix = ""
+        suffix = ""
+        
         # Influence de l'extraversion
-        if self.traits["extraversion"].value > 0.7:
-            response = response.replace(".", "!")
-            response = f"😊 {response}"
-        elif self.traits["extraversion"].value < 0.3:
-            response = response.replace("!", ".")
-            response = response.strip("!") + "..."
+        extraversion = self.traits["extraversion"].value
+        if extraversion > 0.7:
+            response = response.translate(_EXCITED_TABLE)
+            prefix = "😊 "
+        elif extraversion < 0.3:
+            response = response.translate(_CALM_TABLE)
+            suffix = "..."
         
         # Influence de l'ouverture
         if self.traits["openness"].value > 0.7:
-            response = f"{response}\n\nD'ailleurs, cela me fait penser à..."
+            suffix += "\n\nD'ailleurs, cela me fait penser à..."
         
         # Influence des émotions
         if self.emotional_state.joy > 0.7:
-            response = f"Je suis ravi de vous dire que {response} 🌟"
+            prefix = f"Je suis ravi de vous dire que {prefix}"
+            suffix += " 🌟"
         elif self.emotional_state.sadness > 0.7:
-            response = f"Malheureusement, {response} 😔"
+            prefix = f"Malheureusement, {prefix}"
+            suffix += " 😔"
         
-        return response
+        return f"{prefix}{response}{suffix}"
     
     def process_interaction(self, interaction: str):
         """Traite une interaction et met à jour l'état émotionnel."""
-        # Analyse simple des mots-clés pour les émotions
-        positive_words = ["excellent", "super", "bravo", "merci"]
-        negative_words = ["erreur", "problème", "mauvais", "échec"]
+        # Analyse simple des mots-clés pour les émotions : chaque mot présent
+        # compte une fois, quel que soit son nombre d'occurrences
+        positive = {word.lower() for word in _POSITIVE_RE.findall(interaction)}
+        negative = {word.lower() for word in _NEGATIVE_RE.findall(interaction)}
         
         stimulus = {
-            "joy": sum(word in interaction.lower() for word in positive_words) * 0.2,
-            "sadness": sum(word in interaction.lower() for word in negative_words) * 0.2
+            "joy": len(positive) * 0.2,
+            "sadness": len(negative) * 0.2
         }
         
         self.emotional_state.update(stimulus)
-        self.emotional_history.append({
+        entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "interaction": interaction,
-            "emotional_state": self.emotional_state.dict()
-        })
+            "emotional_state": self.emotional_state.model_dump()
+        }
+        self.emotional_history.append(entry)
+        
+        if self.history_path:
+            with open(self.history_path, "ab") as history:
+                history.write(orjson.dumps(entry) + b"\n")
+            if len(self.emotional_history) > self.history_window:
+                del self.emotional_history[:-self.history_window]
     
     def get_personality_influence(self) -> Dict[str, float]:
         """Calcule l'influence de la personnalité sur le comportement."""
@@ -124,13 +162,18 @@ class AgentPersonality(BaseModel):
         }
     
     def save_state(self, file_path: str):
-        """Sauvegarde l'état de la personnalité."""
+        """
+        Sauvegarde l'état de la personnalité.
+        L'historique n'est inclus que s'il n'est pas déjà journalisé.
+        """
+        state: Dict[str, Any] = {
+            "traits": {k: v.model_dump() for k, v in self.traits.items()},
+            "emotional_state": self.emotional_state.model_dump()
+        }
+        if not self.history_path:
+            state["emotional_history"] = self.emotional_history
         with open(file_path, 'w') as f:
-            json.dump({
-                "traits": {k: v.dict() for k, v in self.traits.items()},
-                "emotional_state": self.emotional_state.dict(),
-                "emotional_history": self.emotional_history
-            }, f, indent=2)
+            json.dump(state, f, indent=2)
     
     def load_state(self, file_path: str):
         """Charge l'état de la personnalité."""
@@ -140,4 +183,13 @@ class AgentPersonality(BaseModel):
                 k: PersonalityTrait(**v) for k, v in data["traits"].items()
             }
             self.emotional_state = EmotionalState(**data["emotional_state"])
-            self.emotional_history = data["emotional_history"] 
\ No newline at end of file
+            self.emotional_history = data.get("emotional_history", [])
+        
+        # Relire la fin du journal ligne par ligne
+        if self.history_path and os.path.exists(self.history_path):
+            window: Deque[Dict[str, Any]] = deque(maxlen=self.history_window)
+            with open(self.history_path, "rb") as history:
+                for line in history:
+                    if line.strip():
+                        window.append(orjson.loads(line))
+            self.emotional_history = list(window)
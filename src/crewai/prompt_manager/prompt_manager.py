@@ -2,15 +2,22 @@
 Core implementation of the Prompt Manager.
 """
 
-from typing import Dict, Optional, List
-from pydantic import BaseModel
+from typing import Any, Dict, Optional, List
+from pydantic.config import ConfigDict
+from pydantic.fields import Field, PrivateAttr
+from pydantic.main import BaseModel
 from pathlib import Path
-import json
+import orjson
 import os
 
 from .prompt_template import PromptTemplate
 from .prompt_version import PromptVersion
 
+_IO_BUFFER_SIZE = 64 * 1024
+
+# fdatasync is not available on every platform
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
 
 class PromptManager(BaseModel):
     """
@@ -18,9 +25,13 @@ class PromptManager(BaseModel):
     templating, and dynamic prompt generation.
     """
     
-    templates: Dict[str, PromptTemplate] = {}
+    model_config = ConfigDict(defer_build=True, validate_assignment=False)
+    
+    templates: Dict[str, PromptTemplate] = Field(default_factory=dict)
     storage_path: Optional[Path] = None
     
+    _log_records: int = PrivateAttr(default=0)
+    
     def __init__(self, storage_path: Optional[str] = None):
         """Initialize the PromptManager with optional storage path."""
         super().__init__()
@@ -40,13 +51,20 @@ class PromptManager(BaseModel):
             variables=variables or []
         )
         self.templates[name] = template
-        self._save_templates()
+        self._append_template(template)
         return template
     
     def get_template(self, name: str) -> Optional[PromptTemplate]:
         """Retrieve a prompt template by name."""
         return self.templates.get(name)
     
+    def render_template(self, name: str, /, **variables: Any) -> str:
+        """Render a template by name with the provided variables."""
+        template = self.templates.get(name)
+        if not template:
+            raise KeyError(f"Template '{name}' not found")
+        return template.format(**variables)
+    
     def update_template(self, name: str, content: str,
                        description: Optional[str] = None,
                        variables: Optional[List[str]] = None) -> PromptTemplate:
@@ -62,33 +80,74 @@ class PromptManager(BaseModel):
         if variables:
             template.variables = variables
             
-        self._save_templates()
+        self._append_template(template)
         return template
     
     def _load_templates(self) -> None:
-        """Load templates from storage."""
+        """
+        Load templates from storage.
+        The log is replayed in order, so the last record of each template wins.
+        """
         if not self.storage_path:
             return
             
-        template_file = self.storage_path / "templates.json"
-        if not template_file.exists():
+        log_file = self.storage_path / "templates.ndjson"
+        if not log_file.exists():
             return
             
-        with open(template_file, "r") as f:
-            data = json.load(f)
-            for template_data in data:
-                template = PromptTemplate.parse_obj(template_data)
-                self.templates[template.name] = template
+        records: Dict[str, Dict[str, Any]] = {}
+        torn = False
+        with open(log_file, "rb", buffering=_IO_BUFFER_SIZE) as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Append interrupted before the end of the record
+                    torn = True
+                    break
+                if line.strip():
+                    record = orjson.loads(line)
+                    records[record["name"]] = record
+                    self._log_records += 1
+        for record in records.values():
+            template = PromptTemplate.from_storage(
+                record["data"], record.get("derived_variables", False)
+            )
+            self.templates[template.name] = template
+        if torn:
+            self._compact()
+    
+    @staticmethod
+    def _log_record(template: PromptTemplate) -> bytes:
+        """Serialize a template as one line of the log."""
+        return (
+            b'{"name":' + orjson.dumps(template.name) +
+            b',"derived_variables":' + orjson.dumps(template.derives_variables) +
+            b',"data":' + template.to_json() + b'}\n'
+        )
+    
+    def _append_template(self, template: PromptTemplate) -> None:
+        """Append the current state of a template to the storage log."""
+        if not self.storage_path:
+            return
+            
+        log_file = self.storage_path / "templates.ndjson"
+        with open(log_file, "ab", buffering=_IO_BUFFER_SIZE) as f:
+            f.write(self._log_record(template))
+        self._log_records += 1
+        
+        if self._log_records > 2 * len(self.templates):
+            self._compact()
     
-    def _save_templates(self) -> None:
-        """Save templates to storage."""
+    def _compact(self) -> None:
+        """Rewrite the storage log with a single record per template."""
         if not self.storage_path:
             return
             
-        template_file = self.storage_path / "templates.json"
-        with open(template_file, "w") as f:
-            json.dump(
-                [template.dict() for template in self.templates.values()],
-                f,
-                indent=2
-            ) 
\ No newline at end of file
+        log_file = self.storage_path / "templates.ndjson"
+        tmp_file = self.storage_path / "templates.ndjson.tmp"
+        with open(tmp_file, "wb", buffering=_IO_BUFFER_SIZE) as f:
+            for template in self.templates.values():
+                f.write(self._log_record(template))
+            f.flush()
+            _fdatasync(f.fileno())
+        os.replace(tmp_file, log_file)
+        self._log_records = len(self.templates)
@@ -2,33 +2,123 @@
 Implementation of the Prompt Template system.
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from typing import List, Optional, Dict, Any, Iterable, Sequence, Tuple
+from pydantic.config import ConfigDict
+from pydantic.fields import PrivateAttr
+from pydantic.main import BaseModel
 from datetime import datetime
+from functools import lru_cache
 import string
+import sys
 
 from .prompt_version import PromptVersion
 
+_Parsed = Tuple[Tuple[str, ...], Tuple[Tuple[str, str, int], ...]]
+
+
+@lru_cache(maxsize=1024)
+def _parse(content: str) -> _Parsed:
+    """
+    Split template content into literal chunks and placeholders.
+    Returns the literals and the (name, source text, offset) of each
+    placeholder, with one more literal than placeholders. Escaped delimiters are
+    resolved in the literals, as string.Template does.
+    """
+    literals = []
+    placeholders = []
+    literal = []
+    position = 0
+    for match in string.Template.pattern.finditer(content):
+        literal.append(content[position:match.start()])
+        position = match.end()
+        name = match.group("named") or match.group("braced")
+        if name:
+            literals.append("".join(literal))
+            placeholders.append((name, match.group(), match.start()))
+            literal = []
+        elif match.group("escaped") is not None:
+            literal.append(string.Template.delimiter)
+        else:
+            literal.append(match.group())
+    literal.append(content[position:])
+    literals.append("".join(literal))
+    return tuple(literals), tuple(placeholders)
+
+
+def _version_from_storage(version_data: Dict[str, Any]) -> PromptVersion:
+    """Build a stored version without validation, parsing its timestamp."""
+    return PromptVersion.from_dict({
+        **version_data,
+        "content": sys.intern(version_data["content"])
+    })
+
 
 class PromptTemplate(BaseModel):
     """
     A template for prompts that supports versioning and variable interpolation.
     """
     
+    model_config = ConfigDict(defer_build=True, arbitrary_types_allowed=True)
+    
     name: str
     content: str
     description: Optional[str] = None
     variables: List[str] = []
     versions: List[PromptVersion] = []
     
+    _derived_variables: Optional[List[str]] = PrivateAttr(default=None)
+    
     def __init__(self, **data):
-        """Initialize the template and create initial version."""
+        """
+        Initialize the template and create initial version.
+        Without explicit variables, every placeholder of the content is required,
+        and the list follows the content of later versions.
+        """
         super().__init__(**data)
         if not self.versions:
             self.add_version(self.content)
+        if not self.variables:
+            self._derive_variables()
+    
+    @classmethod
+    def from_storage(
+        cls,
+        template_data: Dict[str, Any],
+        derived_variables: bool = False
+    ) -> "PromptTemplate":
+        """
+        Build a template from previously saved data without validating it.
+        derived_variables restores whether the variables follow the content.
+        """
+        template_data["content"] = sys.intern(template_data["content"])
+        template_data["versions"] = [
+            _version_from_storage(version_data)
+            for version_data in template_data.get("versions", [])
+        ]
+        template = cls.model_construct(**template_data)
+        if derived_variables:
+            template._derived_variables = template.variables
+        return template
+    
+    def __eq__(self, other: Any) -> bool:
+        """Compare field values, ignoring private state."""
+        if not isinstance(other, PromptTemplate):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+    
+    @property
+    def derives_variables(self) -> bool:
+        """Whether the variables are derived from the content."""
+        return self.variables is self._derived_variables
+    
+    def to_json(self) -> bytes:
+        """Serialize the template to JSON bytes."""
+        return self.model_dump_json().encode()
     
     def add_version(self, content: str) -> PromptVersion:
         """Add a new version of the template."""
+        # Template and version share one interned string
+        content = sys.intern(content)
         version = PromptVersion(
             content=content,
             version=len(self.versions) + 1,
@@ -36,6 +126,8 @@ class PromptTemplate(BaseModel):
         )
         self.versions.append(version)
         self.content = content
+        if self.derives_variables:
+            self._derive_variables()
         return version
     
     def get_version(self, version: int) -> Optional[PromptVersion]:
@@ -45,20 +137,167 @@ class PromptTemplate(BaseModel):
         except IndexError:
             return None
     
+    def _placeholder_names(self) -> List[str]:
+        """Return the placeholder names of the content, in order of first use."""
+        _, placeholders = _parse(self.content)
+        return list(dict.fromkeys(name for name, _, _ in placeholders))
+    
+    def _derive_variables(self) -> None:
+        """Require every placeholder of the content, until variables are reassigned."""
+        self.variables = self._placeholder_names()
+        self._derived_variables = self.variables
+    
+    def _check_variables(self, kwargs: Dict[str, Any]) -> None:
+        """Raise if a required variable is missing."""
+        missing_vars = [name for name in self.variables if name not in kwargs]
+        if missing_vars:
+            raise ValueError(
+                f"Missing required variables: {', '.join(missing_vars)}"
+            )
+    
+    @staticmethod
+    def _join(
+        literals: Sequence[str],
+        placeholders: Sequence[Tuple[str, str, int]],
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """Join literals with substituted values, keeping unknown placeholders."""
+        parts = [literals[0]]
+        for (name, source, _), literal in zip(placeholders, literals[1:]):
+            parts.append(str(kwargs[name]) if name in kwargs else source)
+            parts.append(literal)
+        return "".join(parts)
+    
     def format(self, **kwargs: Dict[str, Any]) -> str:
         """
         Format the template with the provided variables.
         Validates that all required variables are provided.
         """
-        missing_vars = set(self.variables) - set(kwargs.keys())
+        self._check_variables(kwargs)
+        literals, placeholders = _parse(self.content)
+        return self._join(literals, placeholders, kwargs)
+    
+    def format_many(self, rows: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Format the template once per variable dictionary.
+        The template is parsed and the required variables resolved once for the whole batch.
+        """
+        literals, placeholders = _parse(self.content)
+        head = literals[0]
+        chunks = [
+            (name, source, literal)
+            for (name, source, _), literal in zip(placeholders, literals[1:])
+        ]
+        required = self.variables
+        join = "".join
+        
+        results: List[str] = []
+        append = results.append
+        for row in rows:
+            missing_vars = [name for name in required if name not in row]
+            if missing_vars:
+                raise ValueError(
+                    f"Missing required variables: {', '.join(missing_vars)}"
+                )
+            parts = [head]
+            for name, source, literal in chunks:
+                parts.append(str(row[name]) if name in row else source)
+                parts.append(literal)
+            append(join(parts))
+        return results
+    
+    def _split_index(self, dynamic: Iterable[str]) -> int:
+        """
+        Return the index of the first placeholder that belongs to the dynamic part.
+        Without dynamic names, the first placeholder starts the dynamic part.
+        """
+        _, placeholders = _parse(self.content)
+        dynamic = set(dynamic)
+        if not dynamic:
+            return 0
+        for index, (name, _, _) in enumerate(placeholders):
+            if name in dynamic:
+                return index
+        return len(placeholders)
+    
+    def split_content(self, dynamic: Iterable[str] = ()) -> Tuple[str, str]:
+        """
+        Split the content before the first dynamic placeholder.
+        Returns the static head and the dynamic tail of the template.
+        """
+        _, placeholders = _parse(self.content)
+        index = self._split_index(dynamic)
+        if index == len(placeholders):
+            return self.content, ""
+        offset = placeholders[index][2]
+        return self.content[:offset], self.content[offset:]
+    
+    def render_static(
+        self,
+        dynamic: Iterable[str] = (),
+        /,
+        **kwargs: Dict[str, Any]
+    ) -> str:
+        """
+        Render the part of the template that precedes the first dynamic variable.
+        Variables of this part are substituted from kwargs; as long as they do not
+        change, the result is identical across calls, so LLM providers can cache it.
+        """
+        literals, placeholders = _parse(self.content)
+        index = self._split_index(dynamic)
+        head = placeholders[:index]
+        missing_vars = [
+            name for name in dict.fromkeys(name for name, _, _ in head)
+            if name in self.variables and name not in kwargs
+        ]
         if missing_vars:
             raise ValueError(
                 f"Missing required variables: {', '.join(missing_vars)}"
             )
-            
-        template = string.Template(self.content)
-        return template.safe_substitute(**kwargs)
+        return self._join(literals[:index + 1], head, kwargs)
+    
+    def render_dynamic(
+        self,
+        dynamic: Iterable[str] = (),
+        /,
+        **kwargs: Dict[str, Any]
+    ) -> str:
+        """
+        Render the part of the template that starts at the first dynamic variable.
+        Validates that all required variables are provided.
+        """
+        self._check_variables(kwargs)
+        literals, placeholders = _parse(self.content)
+        index = self._split_index(dynamic)
+        if index == len(placeholders):
+            return ""
+        return self._join(
+            ("",) + literals[index + 1:], placeholders[index:], kwargs
+        )
+    
+    def to_messages(
+        self,
+        dynamic: Iterable[str] = (),
+        /,
+        **kwargs: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build chat messages with the static head first, marked as cacheable,
+        followed by the rendered dynamic tail.
+        """
+        dynamic = tuple(dynamic)
+        return [
+            {
+                "role": "system",
+                "content": self.render_static(dynamic, **kwargs),
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "role": "user",
+                "content": self.render_dynamic(dynamic, **kwargs)
+            }
+        ]
     
     def validate_variables(self, variables: Dict[str, Any]) -> bool:
         """Validate that all required variables are present."""
-        return set(self.variables).issubset(set(variables.keys()))
+        return all(name in variables for name in self.variables)
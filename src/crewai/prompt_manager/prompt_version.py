@@ -2,12 +2,14 @@
 Implementation of prompt versioning system.
 """
 
-from pydantic import BaseModel
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
 
 
-class PromptVersion(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PromptVersion:
     """
     Represents a specific version of a prompt template.
     Tracks content, version number, and metadata.
@@ -18,6 +20,28 @@ class PromptVersion(BaseModel):
     created_at: datetime
     comment: Optional[str] = None
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the version to a JSON-compatible dictionary."""
+        return {
+            "content": self.content,
+            "version": self.version,
+            "created_at": self.created_at.isoformat(),
+            "comment": self.comment
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PromptVersion":
+        """Build a version from a dictionary produced by to_dict."""
+        created_at = data["created_at"]
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        return cls(
+            content=data["content"],
+            version=data["version"],
+            created_at=created_at,
+            comment=data.get("comment")
+        )
+    
     def __str__(self) -> str:
         """String representation of the version."""
         return f"Version {self.version} ({self.created_at.isoformat()})"
@@ -27,13 +51,42 @@ class PromptVersion(BaseModel):
         Calculate the difference between this version and another.
         Returns a string representation of the changes.
         """
-        from difflib import unified_diff
+        a_lines = self.content.splitlines(keepends=True)
+        b_lines = other.content.splitlines(keepends=True)
         
-        diff = unified_diff(
-            self.content.splitlines(keepends=True),
-            other.content.splitlines(keepends=True),
-            fromfile=f'v{self.version}',
-            tofile=f'v{other.version}',
-            lineterm=''
-        )
-        return ''.join(diff) 
\ No newline at end of file
+        # Compare integer line ids rather than the lines themselves
+        ids: Dict[str, int] = {}
+        a_ids = [ids.setdefault(line, len(ids)) for line in a_lines]
+        b_ids = [ids.setdefault(line, len(ids)) for line in b_lines]
+        
+        parts: List[str] = []
+        matcher = SequenceMatcher(None, a_ids, b_ids)
+        for group in matcher.get_grouped_opcodes(3):
+            if not parts:
+                parts.append(f'--- v{self.version}')
+                parts.append(f'+++ v{other.version}')
+            first, last = group[0], group[-1]
+            parts.append(
+                f'@@ -{_format_range(first[1], last[2])} '
+                f'+{_format_range(first[3], last[4])} @@'
+            )
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    parts.extend(' ' + line for line in a_lines[i1:i2])
+                    continue
+                if tag in ('replace', 'delete'):
+                    parts.extend('-' + line for line in a_lines[i1:i2])
+                if tag in ('replace', 'insert'):
+                    parts.extend('+' + line for line in b_lines[j1:j2])
+        return ''.join(parts)
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a line range the way unified diffs do."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f'{beginning}'
+    if not length:
+        beginning -= 1
+    return f'{beginning},{length}'
@@ -0,0 +1,88 @@
+"""
+Tests pour la répartition de l'exécution de tâches entre agents.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crewai.agents.task_dispatch import (
+    aexecute_tasks_parallel,
+    retrieve_memories_batch,
+)
+
+
+class _StubAgent:
+    """Agent minimal, sans exécution asynchrone."""
+    
+    def __init__(self, name):
+        self.name = name
+        self.executed = []
+    
+    def execute_task(self, task, context=None):
+        self.executed.append(task.description)
+        return f"{self.name}:{task.description}"
+
+
+class _StubAsyncAgent(_StubAgent):
+    """Agent minimal avec exécution asynchrone."""
+    
+    async def aexecute_task(self, task, context=None):
+        return self.execute_task(task, context)
+
+
+def test_aexecute_tasks_parallel_with_stub_agents():
+    """Teste l'exécution parallèle de tâches d'agents avec et sans aexecute_task."""
+    plain = _StubAgent("plain")
+    async_agent = _StubAsyncAgent("async")
+    tasks = [
+        SimpleNamespace(description="t1", agent=plain),
+        SimpleNamespace(description="t2", agent=async_agent),
+        SimpleNamespace(description="t3", agent=plain)
+    ]
+    
+    results = asyncio.run(aexecute_tasks_parallel(tasks))
+    assert results == ["plain:t1", "async:t2", "plain:t3"]
+    assert plain.executed == ["t1", "t3"]
+    
+    with pytest.raises(ValueError):
+        asyncio.run(aexecute_tasks_parallel(
+            [SimpleNamespace(description="orpheline", agent=None)]
+        ))
+
+
+class _StubMemory:
+    """Mémoire minimale qui renvoie la requête comme souvenir."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def retrieve(self, query, context, limit):
+        self.calls.append(("retrieve", query, limit))
+        return [f"{query}:{context.get('k')}"]
+
+
+class _StubBatchMemory(_StubMemory):
+    """Mémoire minimale qui traite toutes les requêtes en un appel."""
+    
+    def retrieve_many(self, queries, context, limit):
+        self.calls.append(("retrieve_many", tuple(queries), limit))
+        return [[f"{query}:{context.get('k')}"] for query in queries]
+
+
+def test_retrieve_memories_batch():
+    """Teste la récupération groupée des souvenirs de plusieurs tâches."""
+    tasks = [SimpleNamespace(description="t1"), SimpleNamespace(description="t2")]
+    expected = [["t1:v"], ["t2:v"]]
+    
+    batch_memory = _StubBatchMemory()
+    assert retrieve_memories_batch(batch_memory, tasks, {"k": "v"}) == expected
+    assert batch_memory.calls == [("retrieve_many", ("t1", "t2"), 5)]
+    
+    memory = _StubMemory()
+    assert retrieve_memories_batch(memory, tasks, {"k": "v"}, limit=2) == expected
+    assert memory.calls == [("retrieve", "t1", 2), ("retrieve", "t2", 2)]
+    
+    assert retrieve_memories_batch(None, tasks) == [[], []]
+    assert retrieve_memories_batch(batch_memory, []) == []
@@ -0,0 +1,246 @@
+"""
+Tests pour le réseau de collaboration avancée.
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+from crewai.collaboration.advanced_collaboration import (
+    _TEAM_SCORING_CHUNK,
+    CollaborationLink,
+    CollaborationNetwork,
+    Skill,
+)
+
+
+def _skill(name, level):
+    """Construit une compétence sans description."""
+    return Skill(name=name, level=level, description="")
+
+
+def test_scoring_follows_replaced_agents_and_links():
+    """Teste que les scores suivent un remplacement direct des agents et des liens."""
+    network = CollaborationNetwork()
+    network.add_agent("a", {"python": _skill("python", 0.5)})
+    assert network.find_best_collaborator("a", ["python"]) is None
+    
+    network.agents = {
+        "a": {"python": _skill("python", 0.5)},
+        "b": {"python": _skill("python", 0.9)},
+        "c": {"python": _skill("python", 0.2)}
+    }
+    assert network.find_best_collaborator("b", ["python"]) == "a"
+    assert network.create_optimal_team({"python": 1.0}, 1) == ["b"]
+    
+    # Remplacer les compétences via add_agent
+    network.add_agent("c", {"python": _skill("python", 1.0)})
+    assert network.create_optimal_team({"python": 1.0}, 1) == ["c"]
+    
+    network.add_collaboration("a", "b", 0.9)
+    network.links = []
+    network.add_collaboration("c", "b", 0.1)
+    assert network.analyze_network()["density"] == 1 / 6
+
+
+def test_links_appended_directly_are_indexed():
+    """Teste qu'un lien ajouté directement à links est pris en compte."""
+    network = CollaborationNetwork()
+    network.add_agent("a", {})
+    network.add_agent("b", {"python": _skill("python", 0.5)})
+    network.add_agent("c", {"python": _skill("python", 0.5)})
+    network.add_collaboration("a", "b", 0.5)
+    assert network.find_best_collaborator("a", ["python"]) == "b"
+    
+    network.links.append(CollaborationLink(
+        agent_from="a", agent_to="c", strength=0.8,
+        last_interaction=datetime.utcnow()
+    ))
+    assert network.find_best_collaborator("a", ["python"]) == "c"
+    
+    network.update_collaboration("a", "c", success=True)
+    assert network.links[-1].successful_collaborations == 1
+    assert network.links[-1].strength == pytest.approx(0.9)
+    assert network.create_optimal_team({"python": 1.0, "x": 1.0}, 3) == \
+        _reference_optimal_team(network, {"python": 1.0, "x": 1.0}, 3)
+    
+    network.links.pop()
+    assert network.find_best_collaborator("a", ["python"]) == "b"
+    
+    # Un lien remplacé sur place change d'extrémités
+    network.links[0] = CollaborationLink(
+        agent_from="a", agent_to="c", strength=1.0,
+        last_interaction=datetime.utcnow()
+    )
+    assert network.find_best_collaborator("a", ["python"]) == "c"
+    network.update_collaboration("a", "c", success=False)
+    assert network.links[0].failed_collaborations == 1
+
+
+def _reference_best_collaborator(network, agent_id, required_skills):
+    """Implémentation de référence par boucles de find_best_collaborator."""
+    if agent_id not in network.agents:
+        return None
+    best_score = 0.0
+    best_collaborator = None
+    for potential_id, skills in network.agents.items():
+        if potential_id == agent_id:
+            continue
+        skill_score = sum(
+            skills[skill].level if skill in skills else 0.0
+            for skill in required_skills
+        ) / len(required_skills)
+        collaboration_strength = 0.5
+        for link in network.links:
+            if link.agent_from == agent_id and link.agent_to == potential_id:
+                collaboration_strength = link.strength
+                break
+        total_score = skill_score * 0.7 + collaboration_strength * 0.3
+        if total_score > best_score:
+            best_score = total_score
+            best_collaborator = potential_id
+    return best_collaborator
+
+
+def _reference_optimal_team(network, task_requirements, team_size):
+    """Implémentation de référence par boucles de create_optimal_team."""
+    team = []
+    remaining_skills = task_requirements.copy()
+    while len(team) < team_size and remaining_skills:
+        best_agent = None
+        best_score = 0.0
+        for agent_id, skills in network.agents.items():
+            if agent_id in team:
+                continue
+            score = 0.0
+            for skill_name, required_level in remaining_skills.items():
+                if skill_name in skills:
+                    score += min(skills[skill_name].level, required_level)
+            if team:
+                collaboration_score = 0.0
+                for team_member in team:
+                    for link in network.links:
+                        if ((link.agent_from == agent_id and
+                             link.agent_to == team_member) or
+                            (link.agent_from == team_member and
+                             link.agent_to == agent_id)):
+                            collaboration_score += link.strength
+                score += collaboration_score / len(team) * 0.3
+            if score > best_score:
+                best_score = score
+                best_agent = agent_id
+        if not best_agent:
+            break
+        team.append(best_agent)
+        for skill_name in list(remaining_skills.keys()):
+            if skill_name in network.agents[best_agent]:
+                remaining_skills[skill_name] = max(
+                    0.0,
+                    remaining_skills[skill_name] -
+                    network.agents[best_agent][skill_name].level
+                )
+                if remaining_skills[skill_name] == 0.0:
+                    del remaining_skills[skill_name]
+    return team
+
+
+def _random_network(rng, extra_nodes=(), n_agents=(1, 8), n_links=(0, 15)):
+    """Construit un réseau aléatoire, de petite taille par défaut."""
+    network = CollaborationNetwork()
+    agents = [f"a{i}" for i in range(rng.randint(*n_agents))]
+    skill_names = list("pqrstu")
+    for agent_id in agents:
+        network.add_agent(agent_id, {
+            name: _skill(name, round(rng.random(), 2))
+            for name in rng.sample(skill_names, rng.randint(0, 4))
+        })
+    endpoints = agents + list(extra_nodes)
+    for _ in range(rng.randint(*n_links)):
+        network.add_collaboration(
+            rng.choice(endpoints), rng.choice(endpoints), round(rng.random(), 2)
+        )
+    for _ in range(5):
+        network.update_collaboration(
+            rng.choice(agents), rng.choice(agents), rng.random() < 0.5
+        )
+    return network, agents, skill_names
+
+
+def test_selection_matches_reference_loops():
+    """Teste la sélection vectorisée contre les boucles de référence."""
+    for seed in range(200):
+        rng = random.Random(seed)
+        network, agents, skill_names = _random_network(rng)
+        required = rng.sample(skill_names, rng.randint(1, 3))
+        requirements = {
+            name: round(rng.random(), 2)
+            for name in rng.sample(skill_names, rng.randint(1, 4))
+        }
+        team_size = rng.randint(1, 5)
+        
+        assert network.find_best_collaborator(agents[0], required) == \
+            _reference_best_collaborator(network, agents[0], required)
+        assert network.create_optimal_team(dict(requirements), team_size) == \
+            _reference_optimal_team(network, requirements, team_size)
+
+
+def test_large_team_selection_matches_reference_loops():
+    """Teste la sélection avec élagage, au-delà de _TEAM_SCORING_CHUNK agents."""
+    for seed in range(20):
+        rng = random.Random(seed)
+        network, agents, skill_names = _random_network(
+            rng, n_agents=(_TEAM_SCORING_CHUNK + 1, 150), n_links=(0, 300)
+        )
+        requirements = {
+            name: round(rng.uniform(0.5, 3.0), 2)
+            for name in rng.sample(skill_names, rng.randint(1, 6))
+        }
+        team_size = rng.randint(1, 8)
+        
+        assert network.create_optimal_team(dict(requirements), team_size) == \
+            _reference_optimal_team(network, requirements, team_size)
+
+
+def test_analyze_network_matches_networkx():
+    """Teste les indicateurs du réseau contre networkx."""
+    nx = pytest.importorskip("networkx")
+    
+    for seed in range(200):
+        rng = random.Random(seed)
+        network, _, _ = _random_network(rng, extra_nodes=("x", "y"))
+        
+        graph = nx.DiGraph()
+        graph.add_nodes_from(network.agents)
+        graph.add_edges_from(
+            (link.agent_from, link.agent_to) for link in network.links
+        )
+        analysis = network.analyze_network()
+        
+        assert analysis["density"] == pytest.approx(nx.density(graph))
+        assert analysis["centrality"] == pytest.approx(nx.degree_centrality(graph))
+        assert analysis["average_clustering"] == pytest.approx(
+            nx.average_clustering(graph.to_undirected())
+        )
+        assert set(analysis["communities"]) == {
+            frozenset(component)
+            for component in nx.connected_components(graph.to_undirected())
+        }
+
+
+def test_network_save_load_roundtrip(tmp_path):
+    """Teste la sauvegarde puis le rechargement du réseau."""
+    network, agents, skill_names = _random_network(random.Random(0))
+    network.teams = {"core": agents[:2]}
+    path = tmp_path / "network.json"
+    network.save_network(str(path))
+    
+    reloaded = CollaborationNetwork()
+    reloaded.load_network(str(path))
+    
+    assert reloaded.agents == network.agents
+    assert reloaded.links == network.links
+    assert reloaded.teams == network.teams
+    assert reloaded.analyze_network() == network.analyze_network()
+    assert reloaded.create_optimal_team({"p": 1.0, "q": 0.5}, 3) == \
+        network.create_optimal_team({"p": 1.0, "q": 0.5}, 3)
@@ -0,0 +1,79 @@
+"""
+Tests pour la personnalité et les émotions des agents.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from crewai.personality.agent_personality import AgentPersonality, EmotionalState
+
+
+def test_personality_influence_follows_direct_changes():
+    """Teste que l'influence suit les modifications directes des traits et émotions."""
+    personality = AgentPersonality()
+    influence = personality.get_personality_influence()
+    assert influence["creativity"] == pytest.approx(0.5)
+    
+    # Usage documenté dans le README
+    personality.traits["openness"].value = 0.9
+    personality.emotional_state.joy = 0.8
+    assert personality.get_personality_influence()["creativity"] == pytest.approx(0.87)
+    
+    # Le dictionnaire rendu appartient à l'appelant
+    influence["creativity"] = 0.0
+    assert personality.get_personality_influence()["creativity"] == pytest.approx(0.87)
+
+
+def test_emotional_history_journal(tmp_path):
+    """Teste la journalisation de l'historique, sa fenêtre et sa relecture."""
+    history_path = tmp_path / "history.ndjson"
+    personality = AgentPersonality(history_path=str(history_path), history_window=3)
+    # La personnalité reste copiable, aucun fichier n'étant gardé ouvert
+    personality.model_copy(deep=True)
+    
+    for i in range(5):
+        personality.process_interaction(f"Merci {i}, excellent travail")
+    
+    assert len(history_path.read_bytes().splitlines()) == 5
+    assert [entry["interaction"] for entry in personality.emotional_history] == [
+        "Merci 2, excellent travail",
+        "Merci 3, excellent travail",
+        "Merci 4, excellent travail"
+    ]
+    
+    # L'historique journalisé n'est pas dupliqué dans l'état sauvegardé
+    state_path = tmp_path / "state.json"
+    personality.save_state(str(state_path))
+    assert "emotional_history" not in state_path.read_text()
+    
+    reloaded = AgentPersonality(history_path=str(history_path), history_window=2)
+    reloaded.load_state(str(state_path))
+    assert reloaded.emotional_state.joy == personality.emotional_state.joy
+    assert [entry["interaction"] for entry in reloaded.emotional_history] == [
+        "Merci 3, excellent travail",
+        "Merci 4, excellent travail"
+    ]
+    
+    # Sans journal existant, la relecture garde l'historique sauvegardé
+    plain = AgentPersonality()
+    plain.process_interaction("Merci, excellent travail")
+    plain_path = tmp_path / "plain.json"
+    plain.save_state(str(plain_path))
+    fresh = AgentPersonality(history_path=str(tmp_path / "absent.ndjson"))
+    fresh.load_state(str(plain_path))
+    assert fresh.emotional_history == plain.emotional_history
+    assert len(fresh.emotional_history) == 1
+    
+    # La fenêtre garde au moins une entrée
+    with pytest.raises(ValidationError):
+        AgentPersonality(history_path=str(history_path), history_window=0)
+
+
+
+def test_emotional_state_update_marks_fields_set():
+    """Teste que les émotions modifiées sont comptées comme définies."""
+    state = EmotionalState()
+    state.update({"joy": 1.0, "fear": 2.0, "inconnue": 1.0}, intensity=0.1)
+    assert state.model_dump(exclude_unset=True) == pytest.approx(
+        {"joy": 0.6, "fear": 0.2}
+    )
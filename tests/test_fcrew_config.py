@@ -0,0 +1,31 @@
+"""
+Tests pour la configuration FCrew.
+"""
+
+from crewai.config.fcrew_config import FCrewConfig
+
+
+def test_config_save_load_roundtrip(tmp_path):
+    """Teste la sauvegarde puis le rechargement de la configuration."""
+    config = FCrewConfig(
+        prompt_storage_path=str(tmp_path / "prompts"),
+        default_prompt_variables={"langue": "fr", "niveau": 2},
+        max_memories=500,
+        debug_mode=True
+    )
+    path = tmp_path / "config" / "fcrew.json"
+    config.save_to_file(str(path))
+    
+    assert FCrewConfig.load_from_file(str(path)) == config
+    assert [p.name for p in path.parent.iterdir()] == ["fcrew.json"]
+    assert config.effective_prompt_storage_path == str(tmp_path / "prompts")
+    
+    # Les clés non textuelles sont écrites comme du texte, comme le faisait json
+    config.default_prompt_variables["niveaux"] = {1: "débutant", 2.5: "moyen"}
+    config.save_to_file(str(path))
+    assert FCrewConfig.load_from_file(str(path)).default_prompt_variables == {
+        "langue": "fr", "niveau": 2, "niveaux": {"1": "débutant", "2.5": "moyen"}
+    }
+    
+    # Un fichier absent donne la configuration par défaut
+    assert FCrewConfig.load_from_file(str(tmp_path / "absent.json")) == FCrewConfig()
@@ -0,0 +1,258 @@
+"""
+Tests pour le gestionnaire de prompts.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+import difflib
+import random
+
+import pytest
+
+from crewai.prompt_manager import PromptManager, PromptTemplate, PromptVersion
+
+
+def test_prompt_template_static_dynamic_split():
+    """Teste la séparation entre partie statique et partie dynamique."""
+    template = PromptTemplate(
+        name="split",
+        content="Prix en $$ :\nAnalyser ${topic}\nContexte: ${relevant_memories}",
+        variables=["topic"]
+    )
+    
+    assert template.render_static() == "Prix en $ :\nAnalyser "
+    dynamic = template.render_dynamic(topic="IA", relevant_memories="aucun")
+    assert dynamic == "IA\nContexte: aucun"
+    assert template.render_static() + dynamic == template.format(
+        topic="IA", relevant_memories="aucun"
+    )
+    
+    messages = template.to_messages(topic="IA")
+    assert messages[0]["role"] == "system"
+    assert messages[0]["cache_control"] == {"type": "ephemeral"}
+    assert messages[1]["content"].startswith("IA")
+    
+    with pytest.raises(ValueError):
+        template.render_dynamic()
+    
+    # Coupure avant la première variable d'exécution : ${topic} reste statique
+    runtime = ("relevant_memories",)
+    static = template.render_static(runtime, topic="IA")
+    assert static == "Prix en $ :\nAnalyser IA\nContexte: "
+    assert template.split_content(runtime) == (
+        "Prix en $$ :\nAnalyser ${topic}\nContexte: ", "${relevant_memories}"
+    )
+    dynamic = template.render_dynamic(runtime, topic="IA", relevant_memories="aucun")
+    assert dynamic == "aucun"
+    assert static + dynamic == template.format(topic="IA", relevant_memories="aucun")
+    messages = template.to_messages(runtime, topic="IA", relevant_memories="x")
+    assert messages[0]["content"] == static
+    assert messages[1]["content"] == "x"
+    with pytest.raises(ValueError):
+        template.render_static(runtime)
+    
+    template.add_version("Sans variable")
+    assert template.render_static() == "Sans variable"
+    assert template.render_dynamic(topic="IA") == ""
+    assert template.render_static(runtime) == "Sans variable"
+    assert template.render_dynamic(runtime, topic="IA") == ""
+
+
+def test_prompt_template_format_many():
+    """Teste le rendu d'un lot de dictionnaires de variables."""
+    template = PromptTemplate(
+        name="batch",
+        content="Analyser ${topic}\nContexte: ${relevant_memories}",
+        variables=["topic"]
+    )
+    
+    rows = [{"topic": "IA"}, {"topic": "ML", "relevant_memories": "aucun"}]
+    assert template.format_many(rows) == [template.format(**row) for row in rows]
+    assert template.format_many([]) == []
+    with pytest.raises(ValueError):
+        template.format_many([{"topic": "IA"}, {}])
+
+
+def test_prompt_template_format_values():
+    """Teste le rendu de valeurs égales mais affichées différemment."""
+    template = PromptTemplate(name="values", content="v=${x}")
+    
+    assert template.format(x=0.0) == "v=0.0"
+    assert template.format(x=-0.0) == "v=-0.0"
+    assert template.format(x=1) == "v=1"
+    assert template.format(x=True) == "v=True"
+    assert template.format(x=Decimal("1.0")) == "v=1.0"
+    assert template.format(x=Decimal("1.00")) == "v=1.00"
+    assert template.format(x=["a"]) == "v=['a']"
+    
+    # Une nouvelle version est prise en compte
+    template.add_version("w=${x}")
+    assert template.format(x=1) == "w=1"
+
+
+def test_prompt_template_derives_variables():
+    """Teste la déduction des variables à partir du contenu."""
+    template = PromptTemplate(name="derived", content="${a} et $b, puis $a et $$c")
+    assert template.variables == ["a", "b"]
+    with pytest.raises(ValueError):
+        template.format(a=1)
+    
+    # Les variables déduites suivent les nouvelles versions
+    template.add_version("Bye ${who}")
+    assert template.variables == ["who"]
+    assert template.format(who="x") == "Bye x"
+    
+    explicit = PromptTemplate(name="explicit", content="${a} et $b", variables=["a"])
+    assert explicit.format(a=1) == "1 et $b"
+    explicit.add_version("${c}")
+    assert explicit.variables == ["a"]
+    
+    # Les variables ajoutées sur place sont exigées immédiatement
+    explicit.variables.append("b")
+    assert not explicit.validate_variables({"a": 1})
+    with pytest.raises(ValueError):
+        explicit.format(a=1)
+
+
+def test_prompt_manager_update_derived_variables(tmp_path):
+    """Teste la mise à jour d'un template dont les variables sont déduites."""
+    manager = PromptManager(storage_path=str(tmp_path))
+    manager.add_template("derived", "Hello ${name}")
+    manager.update_template("derived", "Bye ${who}")
+    assert manager.render_template("derived", who="x") == "Bye x"
+    
+    reloaded = PromptManager(storage_path=str(tmp_path))
+    reloaded.update_template("derived", "Salut ${nom}")
+    assert reloaded.render_template("derived", nom="x") == "Salut x"
+    
+    # Des variables explicites égales aux placeholders restent explicites
+    manager.add_template("explicit", "${a}${b}", variables=["a", "b"])
+    reloaded = PromptManager(storage_path=str(tmp_path))
+    for current in (manager, reloaded):
+        current.update_template("explicit", "${a}${b}${c}")
+        assert current.get_template("explicit").variables == ["a", "b"]
+        assert current.render_template("explicit", a=1, b=2) == "12${c}"
+
+
+def test_prompt_manager_render_template():
+    """Teste le rendu des templates par nom."""
+    manager = PromptManager()
+    manager.add_template(
+        name="greeting",
+        content="Hello ${name}!",
+        variables=["name"]
+    )
+    
+    assert manager.render_template("greeting", name="World") == "Hello World!"
+    assert manager.render_template("greeting", name=["a"]) == "Hello ['a']!"
+    
+    # Des valeurs égales mais rendues différemment restent distinctes
+    assert manager.render_template("greeting", name=1) == "Hello 1!"
+    assert manager.render_template("greeting", name=True) == "Hello True!"
+    assert manager.render_template("greeting", name=1.0) == "Hello 1.0!"
+    assert manager.render_template("greeting", name=-0.0) == "Hello -0.0!"
+    
+    manager.update_template("greeting", content="Bye ${name}!")
+    assert manager.render_template("greeting", name="World") == "Bye World!"
+    
+    with pytest.raises(ValueError):
+        manager.render_template("greeting")
+    with pytest.raises(KeyError):
+        manager.render_template("unknown")
+    
+    # Une affectation directe du contenu est prise en compte partout
+    template = manager.get_template("greeting")
+    assert template.format(name="x") == "Bye x!"
+    template.content = "Salut ${name}!"
+    assert template.format(name="x") == "Salut x!"
+    assert manager.render_template("greeting", name="x") == "Salut x!"
+
+
+def test_prompt_manager_persistence(tmp_path):
+    """Teste la sauvegarde et le rechargement des templates."""
+    manager = PromptManager(storage_path=str(tmp_path))
+    manager.add_template(
+        name="greeting",
+        content="Hello ${name}!",
+        variables=["name"]
+    )
+    manager.update_template("greeting", content="Bye ${name}!")
+    
+    reloaded = PromptManager(storage_path=str(tmp_path))
+    reloaded.add_template(name="other", content="Other")
+    
+    # Les versions rechargées sont conservées à la sauvegarde suivante
+    reloaded = PromptManager(storage_path=str(tmp_path))
+    template = reloaded.get_template("greeting")
+    
+    assert template.content == "Bye ${name}!"
+    assert template.get_version(2).content == "Bye ${name}!"
+    assert template.variables == ["name"]
+    assert len(template.versions) == 2
+    assert template.get_version(1).content == "Hello ${name}!"
+    assert template.format(name="World") == "Bye World!"
+    
+    # Un template rechargé reste un modèle complet
+    assert template.model_dump()["versions"] == [
+        {"content": version.content, "version": version.version,
+         "created_at": version.created_at, "comment": None}
+        for version in manager.get_template("greeting").versions
+    ]
+    assert template == manager.get_template("greeting")
+    
+    # Les mises à jour identiques créent toujours une version
+    reloaded.update_template("greeting", content="Bye ${name}!")
+    assert len(template.versions) == 3
+    readded = reloaded.add_template(name="greeting", content="Bye ${name}!")
+    assert readded is not template
+    assert len(readded.versions) == 1
+    assert len(PromptManager(storage_path=str(tmp_path)).get_template("greeting").versions) == 1
+
+
+def _reference_diff(a: PromptVersion, b: PromptVersion) -> str:
+    """Diff calculé par difflib.unified_diff, comme avant l'optimisation."""
+    return ''.join(difflib.unified_diff(
+        a.content.splitlines(keepends=True),
+        b.content.splitlines(keepends=True),
+        fromfile=f'v{a.version}',
+        tofile=f'v{b.version}',
+        lineterm=''
+    ))
+
+
+def test_prompt_version_diff_matches_difflib():
+    """Teste que le diff sur identifiants de lignes reproduit difflib."""
+    def version(content, number):
+        return PromptVersion(content=content, version=number, created_at=datetime.utcnow())
+    
+    cases = [
+        ("", ""),
+        ("", "a\nb\n"),
+        ("a\nb\n", ""),
+        ("a\nb\nc\n", "a\nb\nc\n"),
+        # Dernières lignes sans retour à la ligne
+        ("a\nb", "a\nb\n"),
+        ("a\nb\n", "a\nc"),
+        ("a\nb", "a\nb"),
+        ("x", "y"),
+    ]
+    rng = random.Random(0)
+    for _ in range(200):
+        lines = [f"ligne {rng.randrange(6)}\n" for _ in range(rng.randrange(20))]
+        other = list(lines)
+        for _ in range(rng.randrange(5)):
+            position = rng.randrange(len(other) + 1)
+            if other and rng.random() < 0.5:
+                del other[min(position, len(other) - 1)]
+            else:
+                other.insert(position, f"ligne {rng.randrange(8)}\n")
+        a, b = "".join(lines), "".join(other)
+        if rng.random() < 0.3:
+            b = b.rstrip("\n")
+        cases.append((a, b))
+    
+    for a, b in cases:
+        old, new = version(a, 1), version(b, 2)
+        assert old.diff(new) == _reference_diff(old, new)
+    
+    assert version("a\nb\n", 1).diff(version("a\nb\n", 2)) == ""
@@ -0,0 +1,129 @@
+"""
+Tests pour le système d'apprentissage par renforcement.
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+from crewai.learning.reinforcement_learning import Experience, ReinforcementLearning
+
+
+def _experience(state, action, reward, next_state):
+    """Construit une expérience horodatée."""
+    return Experience(
+        state=state,
+        action=action,
+        reward=reward,
+        next_state=next_state,
+        timestamp=datetime.now()
+    )
+
+
+def test_update_batch_matches_sequential_updates_with_duplicates():
+    """Teste qu'un lot avec des paires répétées équivaut à des mises à jour successives."""
+    rng = random.Random(0)
+    experiences = [
+        _experience(
+            {"step": float(rng.randrange(3))},
+            rng.choice(["ask_question", "search_memory"]),
+            rng.random(),
+            {"done": float(rng.randrange(2))}
+        )
+        for _ in range(50)
+    ]
+
+    batch = ReinforcementLearning()
+    batch.update_batch(experiences)
+    sequential = ReinforcementLearning()
+    for experience in experiences:
+        sequential.update(experience)
+
+    assert batch.q_table.keys() == sequential.q_table.keys()
+    for state_key, values in sequential.q_table.items():
+        for action, value in values.items():
+            assert batch.q_table[state_key][action] == pytest.approx(value)
+    assert batch.exploration_rate == pytest.approx(sequential.exploration_rate)
+
+    # Des répétitions nombreuses ne dépassent pas la récompense
+    repeated = ReinforcementLearning(discount_factor=0.0)
+    repeated.update_batch([
+        _experience({"step": 0.0}, "ask_question", 1.0, {"step": 1.0})
+        for _ in range(20)
+    ])
+    assert repeated.get_state_value({"step": 0.0}) == pytest.approx(1 - 0.9 ** 20)
+
+
+def test_save_load_model_roundtrip(tmp_path):
+    """Teste la sauvegarde puis le rechargement de la Q-table."""
+    rng = random.Random(1)
+    model = ReinforcementLearning(rng=random.Random(2))
+    for _ in range(100):
+        state = {"step": float(rng.randrange(5)), "progress": round(rng.random(), 2)}
+        next_state = {"step": state["step"] + 1, "progress": state["progress"]}
+        model.update(_experience(
+            state, model.get_action(state), rng.uniform(-1, 1), next_state
+        ))
+    
+    path = tmp_path / "model.json"
+    model.save_model(str(path))
+    reloaded = ReinforcementLearning()
+    reloaded.load_model(str(path))
+    
+    assert reloaded.q_table == model.q_table
+    assert reloaded.exploration_rate == model.exploration_rate
+    assert reloaded.experiences == model.experiences
+    assert reloaded.analyze_performance() == model.analyze_performance()
+    for experience in model.experiences:
+        assert reloaded.get_state_value(experience.state) == \
+            model.get_state_value(experience.state)
+
+
+def test_analyze_performance_after_direct_experience_changes():
+    """Teste l'analyse quand les expériences sont modifiées directement."""
+    model = ReinforcementLearning()
+    model.experiences.append(
+        _experience({"step": 0.0}, "ask_question", 2.0, {"step": 1.0})
+    )
+    assert model.analyze_performance()["max_reward"] == 2.0
+    
+    model.update(_experience({"step": 1.0}, "search_memory", -1.0, {"step": 2.0}))
+    model.experiences = [
+        _experience({"step": 0.0}, "ask_question", 0.5, {"step": 1.0})
+    ]
+    performance = model.analyze_performance()
+    assert performance["average_reward"] == 0.5
+    assert performance["min_reward"] == 0.5
+    assert performance["total_experiences"] == 1
+    
+    # Remplacements de même longueur
+    model.experiences = [
+        _experience({"step": 0.0}, "ask_question", 5.0, {"step": 1.0})
+    ]
+    assert model.analyze_performance()["max_reward"] == 5.0
+    model.experiences[0] = _experience({"step": 0.0}, "ask_question", 3.0, {"step": 1.0})
+    assert model.analyze_performance()["max_reward"] == 3.0
+
+
+def test_q_table_public_api():
+    """Teste la construction, la sérialisation et la protection de q_table."""
+    model = ReinforcementLearning()
+    model.update(_experience({"step": 0.0}, "ask_question", 1.0, {"step": 1.0}))
+    
+    dumped = model.model_dump()
+    assert dumped["q_table"] == model.q_table
+    rebuilt = ReinforcementLearning(q_table=dumped["q_table"])
+    assert rebuilt.q_table == model.q_table
+    assert rebuilt.get_state_value({"step": 0.0}) == model.get_state_value({"step": 0.0})
+    assert ReinforcementLearning.model_validate(dumped).q_table == model.q_table
+    
+    state_key = next(iter(model.q_table))
+    with pytest.raises(TypeError):
+        model.q_table[state_key]["ask_question"] = 5.0
+    with pytest.raises(TypeError):
+        model.q_table[state_key] = {}
+    
+    model.q_table = {state_key: {"search_memory": 5.0}}
+    assert model.get_state_value({"step": 0.0}) == 5.0
+    assert model.get_action({"step": 0.0}) in model.action_space